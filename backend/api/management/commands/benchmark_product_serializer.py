@@ -0,0 +1,45 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Product
+from api.serializers import FastProductSerializer, ProductSerializer
+
+from .benchmark_renderers import build_products
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row cost of ProductSerializer and FastProductSerializer. Rows are rolled back afterwards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500, help='Number of products to serialize.')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement.')
+
+    def handle(self, *args, **options):
+        count, repeat = options['count'], options['repeat']
+
+        with transaction.atomic():
+            seller = get_user_model().objects.create_user(username='benchmark-seller', password=None)
+            products = build_products(count)
+            for product in products:
+                product.seller = seller
+            Product.objects.bulk_create(products)
+            queryset = Product.objects.filter(seller=seller).order_by('name')
+
+            self.stdout.write('%d products, best of %d runs (including the query)' % (count, repeat))
+            self.stdout.write('%-10s %12s %14s' % ('serializer', 'total ms', 'per row us'))
+            for name, serialize in (
+                ('model', lambda: ProductSerializer(queryset.all(), many=True).data),
+                ('fast', lambda: FastProductSerializer(queryset.all()).data),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    serialize()
+                    timings.append(time.perf_counter() - start)
+                best = min(timings)
+                self.stdout.write('%-10s %12.2f %14.1f' % (name, best * 1000, best / count * 1e6))
+
+            transaction.set_rollback(True)
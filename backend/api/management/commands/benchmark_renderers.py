@@ -0,0 +1,67 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Product
+from api.renderers import ColumnarJSONRenderer
+from api.serializers import ProductSerializer
+
+
+def build_products(count):
+    """Unsaved products shaped like real catalog rows; nothing touches the database."""
+    now = timezone.now()
+    return [
+        Product(
+            id=uuid.uuid4(),
+            seller_id=1,
+            name='Product %d' % i,
+            description='Cotton shirt with a relaxed fit, number %d.' % i,
+            price=Decimal('%d.99' % (i % 500)),
+            stock_quantity=i % 40,
+            category='Clothing',
+            brand='MM6',
+            image='products/product_%d.jpg' % i,
+            additional_images=['products/product_%d_back.jpg' % i],
+            gender='Unisex',
+            subcategory='Shirts',
+            sizes=['S', 'M', 'L'],
+            colors=['Red', 'Blue'],
+            variants=[{'size': 'M', 'color': 'Red', 'stock': 5}],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare payload size and render time of JSONRenderer and ColumnarJSONRenderer for product lists.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500, help='Number of products per payload.')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per measurement.')
+
+    def handle(self, *args, **options):
+        count, repeat = options['count'], options['repeat']
+        data = ProductSerializer(build_products(count), many=True).data
+
+        self.stdout.write('%d products, best of %d renders' % (count, repeat))
+        self.stdout.write('%-10s %12s %12s %12s %12s' % ('renderer', 'bytes', 'gzip bytes', 'render ms', 'gzip ms'))
+        for name, renderer in (('json', JSONRenderer()), ('columnar', ColumnarJSONRenderer())):
+            render_times, gzip_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                body = renderer.render(data)
+                render_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                # Same helper GZipMiddleware uses.
+                compressed = compress_string(body)
+                gzip_times.append(time.perf_counter() - start)
+            self.stdout.write('%-10s %12d %12d %12.2f %12.2f' % (
+                name, len(body), len(compressed), min(render_times) * 1000, min(gzip_times) * 1000,
+            ))
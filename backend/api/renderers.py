@@ -0,0 +1,41 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Compact JSON for list payloads. A list of objects is rendered as
+    {"columns": [...], "rows": [[...], ...]} so keys are emitted once per page
+    instead of once per row. Paginated output has its `results` packed the same
+    way. An empty list becomes {"columns": [], "rows": []}; rows with differing
+    keys use the union of keys in first-seen order, with null for missing values.
+    Lists of non-objects, other objects, and nested values are rendered as plain JSON.
+
+    Clients opt in with `Accept: application/vnd.mm6.columnar+json` or `?format=columnar`.
+    """
+    media_type = 'application/vnd.mm6.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(self.pack(data), accepted_media_type, renderer_context)
+
+    @classmethod
+    def pack(cls, data):
+        # Only the result list itself is packed; field values (e.g. `variants`) are left as-is
+        # so a client never has to guess whether {"columns", "rows"} came from us or the data.
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            return dict(data, results=cls.pack_rows(data['results']))
+        if isinstance(data, list):
+            return cls.pack_rows(data)
+        return data
+
+    @staticmethod
+    def pack_rows(rows):
+        if not all(isinstance(row, dict) for row in rows):
+            return rows
+        columns = list(rows[0].keys()) if rows else []
+        if any(list(row.keys()) != columns for row in rows):
+            columns = list(dict.fromkeys(key for row in rows for key in row))
+        return {
+            'columns': columns,
+            'rows': [[row.get(key) for key in columns] for row in rows],
+        }
@@ -1,5 +1,9 @@
+import decimal
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from .models import Product, Order, OrderItem, Payment, PageContent, Affiliate
 
 User = get_user_model()
@@ -29,8 +33,156 @@ class ProductSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('seller', 'created_at', 'updated_at')
 
+class FastProductSerializer:
+    """
+    Read-only fast path for ProductSerializer(many=True). Output is built straight from
+    `.values()` rows with converters compiled once per call from ProductSerializer's own
+    fields, so model instantiation and per-field attribute lookups are skipped.
+
+    If any field cannot be read with a `.values()` lookup (method fields, `source='*'`,
+    nested serializers, properties, nullable or reverse relations), the whole call falls
+    back to `serializer_class(many=True)`.
+    """
+    serializer_class = ProductSerializer
+
+    def __init__(self, queryset, context=None):
+        self.queryset = queryset
+        self.context = context or {}
+
+    def get_converters(self):
+        """
+        Returns (name, lookup, converter) per readable field, or None if a field
+        cannot be served from `.values()`.
+        """
+        converters = []
+        for name, field in self.serializer_class(context=self.context).fields.items():
+            if field.write_only:
+                continue
+            model_field = self.resolve_model_field(field)
+            if model_field is None:
+                return None
+            converters.append((name, '__'.join(field.source_attrs), self.compile_field(field, model_field)))
+        return converters
+
+    def resolve_model_field(self, field):
+        """
+        The model field behind `field.source_attrs`, following only non-null forward
+        relations so the `.values()` lookup yields exactly one value per row.
+        """
+        if not field.source_attrs or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+
+        model = self.serializer_class.Meta.model
+        for position, attr in enumerate(field.source_attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+            if position < len(field.source_attrs) - 1:
+                if not model_field.is_relation or model_field.null:
+                    return None
+                model = model_field.related_model
+
+        if model_field.is_relation:
+            # `.values()` yields the raw key, which only a plain PrimaryKeyRelatedField renders as-is.
+            if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None:
+                return None
+        elif isinstance(field, serializers.RelatedField):
+            return None
+        if isinstance(field, serializers.FileField) and not isinstance(model_field, models.FileField):
+            return None
+        return model_field
+
+    def compile_field(self, field, model_field):
+        if isinstance(field, serializers.FileField):
+            storage = model_field.storage
+            use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+            request = self.context.get('request')
+
+            def convert_file(name):
+                if not name:
+                    return None
+                if not use_url:
+                    return name
+                url = storage.url(name)
+                if request is not None:
+                    return request.build_absolute_uri(url)
+                return url
+            return convert_file
+
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+            return str
+
+        # DRF only sets `coerce_to_string` when it is passed explicitly, so read it the way
+        # DecimalField.to_representation does; anything unusual falls back to the field itself.
+        if isinstance(field, serializers.DecimalField) \
+                and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING) \
+                and not field.localize and not getattr(field, 'normalize_output', False) \
+                and field.decimal_places is not None:
+            quantum = decimal.Decimal('.1') ** field.decimal_places
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            rounding = field.rounding
+
+            def convert_decimal(value):
+                if not isinstance(value, decimal.Decimal):
+                    value = decimal.Decimal(str(value).strip())
+                return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+            return convert_decimal
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # `.values()` already yields the raw foreign key.
+            return None
+
+        if isinstance(field, (serializers.CharField, serializers.IntegerField,
+                              serializers.BooleanField, serializers.JSONField)) \
+                and not getattr(field, 'binary', False):
+            # The database converters already return the represented type.
+            return None
+
+        return field.to_representation
+
+    @property
+    def data(self):
+        converters = self.get_converters()
+        if converters is None:
+            return self.serializer_class(self.queryset, many=True, context=self.context).data
+
+        rows = self.queryset.values(*[lookup for _, lookup, _ in converters])
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert in converters:
+                value = row[lookup]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+class OrderItemProductSerializer(ProductSerializer):
+    """
+    Nested product of an order item. When the view has prebuilt product dicts with
+    FastProductSerializer (`context['products']`, keyed by id), they are used as-is
+    instead of loading and serializing each item's product.
+    """
+
+    def get_attribute(self, instance):
+        products = self.context.get('products')
+        if products is None:
+            return super().get_attribute(instance)
+        if instance.product_id is None:
+            return None
+        return products.get(str(instance.product_id))
+
+    def to_representation(self, instance):
+        if isinstance(instance, dict):
+            return instance
+        return super().to_representation(instance)
+
 class OrderItemSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = OrderItemProductSerializer(read_only=True)
     product_id = serializers.UUIDField(write_only=True)
 
     class Meta:
@@ -0,0 +1,243 @@
+import json
+import warnings
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.models import Order, OrderItem, Product
+from api.renderers import ColumnarJSONRenderer
+from api import throttling
+from api.serializers import FastProductSerializer, OrderSerializer, ProductSerializer
+
+User = get_user_model()
+
+
+class ColumnarJSONRendererTests(TestCase):
+    def render(self, data):
+        return json.loads(ColumnarJSONRenderer().render(data))
+
+    def test_list_is_packed_once(self):
+        data = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+        self.assertEqual(self.render(data), {'columns': ['id', 'name'], 'rows': [[1, 'a'], [2, 'b']]})
+
+    def test_nested_values_are_left_alone(self):
+        variants = [{'size': 'M', 'stock': 5}, {'size': 'L', 'stock': 2}]
+        data = [{'id': 1, 'variants': variants}]
+        self.assertEqual(self.render(data)['rows'], [[1, variants]])
+
+    def test_paginated_results_are_packed(self):
+        data = {'count': 1, 'next': None, 'results': [{'id': 1}]}
+        self.assertEqual(self.render(data), {'count': 1, 'next': None, 'results': {'columns': ['id'], 'rows': [[1]]}})
+
+    def test_empty_and_irregular_lists_keep_columnar_shape(self):
+        self.assertEqual(self.render([]), {'columns': [], 'rows': []})
+        self.assertEqual(self.render({'count': 0, 'results': []}), {'count': 0, 'results': {'columns': [], 'rows': []}})
+        self.assertEqual(
+            self.render([{'id': 1, 'name': 'a'}, {'id': 2, 'size': 'M'}]),
+            {'columns': ['id', 'name', 'size'], 'rows': [[1, 'a', None], [2, None, 'M']]},
+        )
+
+    def test_non_list_payloads_render_as_json(self):
+        self.assertEqual(self.render({'error': 'nope'}), {'error': 'nope'})
+        self.assertEqual(self.render(['a', 'b']), ['a', 'b'])
+
+class FastProductSerializerParityTests(TestCase):
+    def setUp(self):
+        self.seller = User.objects.create_user(username='seller', password='pw', role='seller')
+        self.with_image = Product.objects.create(
+            seller=self.seller, name='Linen Shirt', description='Shirt', price=Decimal('10.5'),
+            category='Clothing', brand='MM6', image='products/shirt.jpg',
+            additional_images=['products/shirt_back.jpg'], sizes=['S', 'M'], colors=['Red'],
+            variants=[{'size': 'M', 'color': 'Red', 'stock': 5}], subcategory='Shirts',
+        )
+        self.blank_image = Product.objects.create(
+            seller=self.seller, name='Wool Shirt', description='Warm shirt', price=Decimal('99.999'),
+            category='Clothing', brand='MM6', image='', subcategory=None, is_featured=True,
+        )
+        self.null_image = Product.objects.create(
+            seller=self.seller, name='Jeans', description='Denim', price=Decimal('0'),
+            category='Denim', brand='Other', image=None, gender='Male',
+        )
+
+    def assertParity(self, queryset, context=None):
+        expected = ProductSerializer(queryset, many=True, context=context or {}).data
+        actual = FastProductSerializer(queryset, context=context).data
+        self.assertEqual(actual, [dict(row) for row in expected])
+        self.assertEqual([list(row) for row in actual], [list(row) for row in expected])
+        return actual
+
+    def test_parity_without_request(self):
+        data = self.assertParity(Product.objects.order_by('name'))
+        by_name = {row['name']: row for row in data}
+        self.assertEqual(by_name['Linen Shirt']['image'], '/media/products/shirt.jpg')
+        self.assertIsNone(by_name['Wool Shirt']['image'])
+        self.assertIsNone(by_name['Jeans']['image'])
+        self.assertIsNone(by_name['Wool Shirt']['subcategory'])
+        self.assertEqual(by_name['Linen Shirt']['price'], '10.50')
+        self.assertEqual(by_name['Jeans']['price'], '0.00')
+        self.assertEqual(by_name['Linen Shirt']['variants'], [{'size': 'M', 'color': 'Red', 'stock': 5}])
+
+    def test_parity_with_request(self):
+        request = APIRequestFactory().get('/api/products/')
+        data = self.assertParity(Product.objects.order_by('name'), context={'request': request})
+        by_name = {row['name']: row for row in data}
+        self.assertEqual(by_name['Linen Shirt']['image'], 'http://testserver/media/products/shirt.jpg')
+
+    def test_dotted_source_uses_values_lookup(self):
+        class SellerNameSerializer(ProductSerializer):
+            seller_name = serializers.ReadOnlyField(source='seller.username')
+
+        class FastSellerNameSerializer(FastProductSerializer):
+            serializer_class = SellerNameSerializer
+
+        queryset = Product.objects.order_by('name')
+        converters = FastSellerNameSerializer(queryset).get_converters()
+        self.assertIn(('seller_name', 'seller__username'), [(name, lookup) for name, lookup, _ in converters])
+        expected = SellerNameSerializer(queryset, many=True).data
+        actual = FastSellerNameSerializer(queryset).data
+        self.assertEqual(actual, [dict(row) for row in expected])
+        self.assertEqual(actual[0]['seller_name'], 'seller')
+
+    def test_unsupported_fields_fall_back_to_serializer(self):
+        class MethodFieldSerializer(ProductSerializer):
+            label = serializers.SerializerMethodField()
+
+            def get_label(self, obj):
+                return '%s by %s' % (obj.name, obj.brand)
+
+        class WholeObjectSerializer(ProductSerializer):
+            title = serializers.CharField(source='*', read_only=True)
+
+        class PropertySerializer(ProductSerializer):
+            title = serializers.ReadOnlyField(source='__str__')
+
+        queryset = Product.objects.order_by('name')
+        for serializer_class in (MethodFieldSerializer, WholeObjectSerializer, PropertySerializer):
+            fast = type('Fast' + serializer_class.__name__, (FastProductSerializer,), {'serializer_class': serializer_class})
+            self.assertIsNone(fast(queryset).get_converters(), serializer_class.__name__)
+            expected = serializer_class(queryset, many=True).data
+            self.assertEqual(fast(queryset).data, expected, serializer_class.__name__)
+
+    def test_list_view_matches_product_serializer(self):
+        for query, queryset in (
+            ('', Product.objects.all()),
+            ('?search=shirt&ordering=-price', Product.objects.filter(name__icontains='shirt').order_by('-price')),
+            ('?ordering=price', Product.objects.order_by('price')),
+            ('?category=Denim', Product.objects.filter(category='Denim')),
+        ):
+            response = self.client.get('/api/products/' + query)
+            self.assertEqual(response.status_code, 200)
+            expected = ProductSerializer(queryset, many=True, context={'request': response.wsgi_request}).data
+            self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected)), query)
+
+    def test_order_list_matches_order_serializer(self):
+        buyer = User.objects.create_user(username='buyer', password='pw')
+        order = Order.objects.create(user=buyer, customer_name='Buyer', total_amount=Decimal('20.5'))
+        OrderItem.objects.create(order=order, product=self.with_image, quantity=2, price_at_purchase=Decimal('10.25'))
+        OrderItem.objects.create(order=order, product=self.null_image, quantity=1, price_at_purchase=Decimal('0'))
+        OrderItem.objects.create(order=order, product=None, quantity=1, price_at_purchase=Decimal('1'))
+
+        client = APIClient()
+        client.force_authenticate(buyer)
+        response = client.get('/api/orders/')
+        self.assertEqual(response.status_code, 200)
+        expected = OrderSerializer(Order.objects.all(), many=True, context={'request': response.wsgi_request}).data
+        self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected)))
+
+
+THROTTLED_REST_FRAMEWORK = dict(
+    settings.REST_FRAMEWORK,
+    DEFAULT_THROTTLE_RATES={'auth': '3/min', 'order_create': '2/min', 'upload': '2/min'},
+)
+
+
+@override_settings(REST_FRAMEWORK=THROTTLED_REST_FRAMEWORK)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        throttling._memory_store.buckets.clear()
+        self.client = APIClient()
+
+    def login(self, username='stuffed@example.com', ip='10.0.0.1', **kwargs):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': 'wrong'},
+                                format='json', REMOTE_ADDR=ip, **kwargs)
+
+    def test_login_is_throttled_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, 401)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_same_account_from_new_ip_is_throttled(self):
+        for i in range(3):
+            self.login(ip='10.0.1.%d' % i)
+        self.assertEqual(self.login(ip='10.0.2.1').status_code, 429)
+        self.assertEqual(self.login(username='other@example.com', ip='10.0.2.1').status_code, 401)
+
+    def test_rotating_forwarded_for_does_not_get_fresh_bucket(self):
+        # Behind one proxy, only the address the proxy appended is trusted.
+        for i in range(3):
+            self.login(username='user%d@example.com' % i, HTTP_X_FORWARDED_FOR='198.51.100.%d, 203.0.113.7' % i)
+        response = self.login(username='fresh@example.com', HTTP_X_FORWARDED_FOR='198.51.100.99, 203.0.113.7')
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(REST_FRAMEWORK=dict(THROTTLED_REST_FRAMEWORK, NUM_PROXIES=0))
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        for i in range(3):
+            self.login(username='user%d@example.com' % i, HTTP_X_FORWARDED_FOR='198.51.100.%d' % i)
+        response = self.login(username='fresh@example.com', HTTP_X_FORWARDED_FOR='198.51.100.99')
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(
+        THROTTLE_CACHE='throttle',
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle'}},
+    )
+    def test_long_account_names_give_short_cache_safe_keys(self):
+        username = 'stuffed user ' * 10000
+        with warnings.catch_warnings():
+            # Memcached raises for the keys LocMemCache only warns about.
+            warnings.simplefilter('error', CacheKeyWarning)
+            for _ in range(3):
+                self.assertEqual(self.login(username=username).status_code, 401)
+            self.assertEqual(self.login(username=username, ip='10.0.9.9').status_code, 429)
+
+    def test_register_shares_auth_scope(self):
+        for i in range(3):
+            self.client.post('/api/auth/register/', {'email': 'new%d@example.com' % i, 'password': 'pw'},
+                             format='json', REMOTE_ADDR='10.0.0.9')
+        response = self.client.post('/api/auth/register/', {'email': 'late@example.com', 'password': 'pw'},
+                                    format='json', REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(email='late@example.com').exists())
+
+    def test_malformed_body_is_rejected(self):
+        response = self.client.post('/api/auth/login/', '{not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/auth/login/', '[1, 2]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_order_create_is_throttled_but_updates_are_not(self):
+        admin = User.objects.create_user(username='admin', password='pw', role='admin')
+        self.client.force_authenticate(admin)
+        order = Order.objects.create(user=admin, customer_name='Admin', total_amount=Decimal('1'))
+        for _ in range(2):
+            self.assertEqual(self.client.post('/api/orders/', {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post('/api/orders/', {}, format='json').status_code, 429)
+        response = self.client.patch('/api/orders/%s/' % order.id, {'status': 'shipped'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_memory_store_is_bounded(self):
+        store = throttling.MemoryBucketStore()
+        store.max_entries = 5
+        for i in range(20):
+            store.set('key%d' % i, (1, 100.0), 60)
+        self.assertEqual(list(store.buckets), ['key%d' % i for i in range(15, 20)])
+        store.set('late', (1, 1000.0), 60)
+        self.assertEqual(list(store.buckets), ['late'])
@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import permissions
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class BucketStore:
+    """
+    Stores (tokens, timestamp) per key. Subclasses provide `get` and `set`.
+    """
+
+    def take(self, keys, capacity, refill, now):
+        """
+        Take one token from each bucket in `keys`. Returns None on success, or the
+        seconds to wait if any bucket is empty, in which case nothing is taken.
+        """
+        buckets = []
+        for key in keys:
+            state = self.get(key)
+            if state is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, state[0] + (now - state[1]) * refill)
+            if tokens < 1:
+                return (1 - tokens) / refill
+            buckets.append((key, tokens))
+
+        for key, tokens in buckets:
+            # Keep the entry until the bucket would be full again.
+            self.set(key, (tokens - 1, now), (capacity - tokens + 1) / refill)
+        return None
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Per-process bucket store. Cheap, but every worker keeps its own buckets; set
+    THROTTLE_CACHE to a shared cache alias to enforce limits across workers.
+
+    Entries are kept in least-recently-updated order. Each `set` drops expired
+    entries from the front, at most `evict_batch` of them, then drops the oldest
+    until the store is back at `max_entries`. Dropping a live bucket only
+    forgets that key's usage, and every entry is evicted at most once, so the
+    cost per request stays constant however many keys an attacker rotates through.
+    """
+    max_entries = 10000
+    evict_batch = 100
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, keys, capacity, refill, now):
+        with self.lock:
+            return super().take(keys, capacity, refill, now)
+
+    def get(self, key):
+        entry = self.buckets.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, state, timeout):
+        now = state[1]
+        self.buckets[key] = (state, now + timeout)
+        self.buckets.move_to_end(key)
+
+        evicted = 0
+        while evicted < self.evict_batch and self.buckets:
+            oldest = next(iter(self.buckets.values()))
+            if oldest[1] > now:
+                break
+            self.buckets.popitem(last=False)
+            evicted += 1
+        while len(self.buckets) > self.max_entries:
+            self.buckets.popitem(last=False)
+
+
+class CacheBucketStore(BucketStore):
+    """
+    Buckets in a Django cache, shared by every worker using it. The get/set pair is
+    not atomic, so concurrent requests can both take the last token; DRF's own
+    throttles make the same trade-off.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, state, timeout):
+        self.cache.set(key, state, int(timeout) + 1)
+
+
+_memory_store = MemoryBucketStore()
+
+
+def get_bucket_store():
+    alias = getattr(settings, 'THROTTLE_CACHE', None)
+    if alias:
+        return CacheBucketStore(alias)
+    return _memory_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket limiter. A rate of "10/min" gives a bucket of 10 tokens refilled
+    evenly over a minute, so bursts are allowed up to capacity and then smoothed.
+    Each request takes a token from every bucket returned by `get_keys`; it is
+    rejected (429 with Retry-After) if any of them is empty.
+
+    The scope is read from the view's `throttle_scope` and the rate from
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. Safe methods are not throttled. On
+    viewsets only the actions in the view's `throttle_actions` (default: create)
+    are throttled, so e.g. admin status updates do not spend the create budget.
+    """
+    scope = None
+    timer = time.time
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def parse_rate(self, rate):
+        num, period = rate.split('/')
+        duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        return int(num), duration
+
+    def get_scope(self, view):
+        return self.scope or getattr(view, 'throttle_scope', None)
+
+    def get_keys(self, request, view, scope):
+        keys = ['throttle_%s_ip_%s' % (scope, self.get_ident(request))]
+        if request.user and request.user.is_authenticated:
+            keys.append('throttle_%s_user_%s' % (scope, request.user.pk))
+        return keys
+
+    def allow_request(self, request, view):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        action = getattr(view, 'action', None)
+        if action is not None and action not in getattr(view, 'throttle_actions', ('create',)):
+            return True
+
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        if rate is None:
+            return True
+
+        capacity, duration = self.parse_rate(rate)
+        refill = capacity / duration
+        keys = self.get_keys(request, view, scope)
+        self.wait_seconds = get_bucket_store().take(keys, capacity, refill, self.timer())
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthRateThrottle(TokenBucketThrottle):
+    """
+    Throttle for login and registration. Runs before the view handler, so a
+    rejected request never reaches password hashing. Besides the client IP, the
+    submitted username/email is keyed so one account cannot be stuffed from many IPs.
+    The account is hashed so keys stay short and cache-safe whatever was submitted.
+    """
+    scope = 'auth'
+
+    def get_keys(self, request, view, scope):
+        keys = super().get_keys(request, view, scope)
+        data = request.data if hasattr(request.data, 'get') else {}
+        account = data.get('username') or data.get('email')
+        if account:
+            digest = hashlib.sha256(str(account).strip().lower().encode()).hexdigest()
+            keys.append('throttle_%s_account_%s' % (scope, digest))
+        return keys
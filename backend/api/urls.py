@@ -1,10 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
-from .views import ProductViewSet, OrderViewSet, UserViewSet, DashboardStatsView, PaymentViewSet, RegisterView, PageContentViewSet, AffiliateViewSet
+from rest_framework_simplejwt.views import TokenRefreshView
+from .views import LoginView, ProductViewSet, OrderViewSet, UserViewSet, DashboardStatsView, PaymentViewSet, RegisterView, PageContentViewSet, AffiliateViewSet
 
 router = DefaultRouter()
 router.register(r'products', ProductViewSet)
@@ -16,7 +13,7 @@ router.register(r'affiliates', AffiliateViewSet, basename='affiliate')
 
 urlpatterns = [
     path('', include(router.urls)),
-    path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/login/', LoginView.as_view(), name='token_obtain_pair'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/register/', RegisterView.as_view(), name='auth_register'),
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard_stats'),
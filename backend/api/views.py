@@ -4,13 +4,20 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
+from django.db.models import prefetch_related_objects
+from rest_framework_simplejwt.views import TokenObtainPairView
 from .models import Product, Order, OrderItem, Payment, PageContent, Affiliate
-from .serializers import ProductSerializer, OrderSerializer, UserSerializer, PaymentSerializer, PageContentSerializer, AffiliateSerializer
+from .serializers import ProductSerializer, FastProductSerializer, OrderSerializer, UserSerializer, PaymentSerializer, PageContentSerializer, AffiliateSerializer
+from .throttling import AuthRateThrottle, TokenBucketThrottle
 
 User = get_user_model()
 
+class LoginView(TokenObtainPairView):
+    throttle_classes = [AuthRateThrottle]
+
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     def post(self, request):
         username = request.data.get('username')
@@ -53,11 +60,26 @@ class ProductViewSet(viewsets.ModelViewSet):
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = (parsers.MultiPartParser, parsers.FormParser)
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'upload'
+    throttle_actions = ('create', 'update', 'partial_update')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'subcategory', 'brand', 'seller', 'is_featured', 'is_popular']
     search_fields = ['name', 'description']
     ordering_fields = ['price', 'created_at']
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        # Unpaginated lists can be large; serialize them from `.values()` rows.
+        serializer = FastProductSerializer(queryset, context=self.get_serializer_context())
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         # Allow admins to create products (assign to themselves or handle normally)
         serializer.save(seller=self.request.user)
@@ -65,6 +87,8 @@ class ProductViewSet(viewsets.ModelViewSet):
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'order_create'
 
     def get_queryset(self):
         user = self.request.user
@@ -74,6 +98,26 @@ class OrderViewSet(viewsets.ModelViewSet):
         # For simplicity in this stage: Users see their own orders.
         return Order.objects.filter(user=user)
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        orders = list(page if page is not None else queryset)
+        prefetch_related_objects(orders, 'items')
+
+        # Serialize every product referenced by these orders once, from `.values()` rows,
+        # instead of running ProductSerializer per order item.
+        product_ids = {item.product_id for order in orders for item in order.items.all() if item.product_id}
+        products = FastProductSerializer(
+            Product.objects.filter(pk__in=product_ids), context=self.get_serializer_context()
+        ).data
+        context = dict(self.get_serializer_context(), products={product['id']: product for product in products})
+
+        serializer = self.get_serializer(orders, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     def create(self, request, *args, **kwargs):
         # Custom creation logic to handle items transactionally
         # Expects: { items: [{id, quantity, price}...], total_amount: 100, shipping_address: {...} }
@@ -28,6 +28,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -96,9 +97,25 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'api.renderers.ColumnarJSONRenderer',
+    ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # Proxies in front of the app that append to X-Forwarded-For (Render's load balancer is one).
+    # Throttles key clients on the address the outermost trusted proxy saw; 0 uses REMOTE_ADDR.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '1')),
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': os.environ.get('THROTTLE_RATE_AUTH', '10/min'),
+        'order_create': os.environ.get('THROTTLE_RATE_ORDER_CREATE', '30/min'),
+        'upload': os.environ.get('THROTTLE_RATE_UPLOAD', '60/min'),
+    },
 }
 
+# Cache alias used for rate-limit buckets; unset keeps them in process memory.
+THROTTLE_CACHE = os.environ.get('THROTTLE_CACHE')
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),